@@ -3,9 +3,18 @@ import numpy as np
 import os
 import matplotlib.pyplot as plt
 from rich.console import Console
+from strategy import Signals
 
 console = Console()
 LOG_FILE = "logs/backtest_debug.log"
+MAX_CHART_POINTS = 10000  # Maximální počet bodů historie kapitálu držených v paměti
+MINUTES_PER_YEAR = 60 * 24 * 365
+
+TIMEFRAME_TO_MINUTES = {
+    "1m": 1, "3m": 3, "5m": 5, "15m": 15, "30m": 30,
+    "1h": 60, "2h": 120, "4h": 240, "6h": 360, "12h": 720,
+    "1d": 1440, "1w": 10080, "1M": 43200
+}
 
 class Backtest:
     def __init__(self, strategy, initial_balance=10000):
@@ -15,9 +24,13 @@ class Backtest:
         self.balance = initial_balance
         self.positions = []
         self.trades = []
+        self.trade_details = []  # (směr 1/-1, vstupní cena, výstupní cena, velikost, kapitál před obchodem) ke každému obchodu
         self.max_balance = initial_balance
-        self.drawdowns = []
-        self.capital_history = [initial_balance]  # Historie kapitálu pro graf
+        self.max_drawdown = 0
+        self.capital_history = [initial_balance]  # Historie kapitálu pro graf (každá `history_stride`-tá svíčka)
+        self.history_stride = 1
+        self.yearly_balances = []  # Kapitál na konci každého roku pro výpočet ročního výnosu
+        self.candles_per_year = None
         self.symbol = None  # Přidáme symbol a timeframe
         self.timeframe = None
         self.num_candles = 0  # Počet testovaných svíček
@@ -37,123 +50,180 @@ class Backtest:
 
     def run(self, data: pd.DataFrame, symbol: str, timeframe: str):
         """Spustí backtest."""
+        self._prepare(symbol, timeframe)
+        signals = self.strategy.compute_signals(data)
+
+        self.log_debug(f"[bold yellow]DEBUG: Spouštím backtest pro {symbol} ({timeframe}) na {len(data)} svíčkách...[/bold yellow]")
+
+        self._process_signals(signals)
+
+        return self._summarize(symbol, timeframe)
+
+    def run_stream(self, chunks, symbol: str, timeframe: str):
+        """
+        Spustí backtest nad historií po dávkách svíček (iterovatelné DataFramy, viz `candle_stream`).
+
+        Stav indikátorů i otevřené pozice se přenáší přes hranice dávek, takže výsledek
+        je shodný s `run()` nad celou historií a paměť nezávisí na délce historie.
+        """
+        indicators = self.strategy.create_indicators()
+        if indicators is None:
+            raise TypeError(f"Strategie {type(self.strategy).__name__} nepodporuje streamovací backtest (create_indicators() vrací None)")
+
+        self._prepare(symbol, timeframe)
+        self.log_debug(f"[bold yellow]DEBUG: Spouštím streamovací backtest pro {symbol} ({timeframe})...[/bold yellow]")
+
+        for chunk in chunks:
+            self._process_signals(self.strategy.compute_signals(chunk, indicators))
+
+        return self._summarize(symbol, timeframe)
+
+    def _prepare(self, symbol, timeframe):
+        """Uloží symbol a timeframe před zpracováním první svíčky."""
         self.symbol = symbol
         self.timeframe = timeframe
-        self.num_candles = len(data)  # Uložíme počet svíček
-        data = self.strategy.generate_signals(data, self.balance, self.max_balance)
+        if timeframe in TIMEFRAME_TO_MINUTES:
+            self.candles_per_year = MINUTES_PER_YEAR / TIMEFRAME_TO_MINUTES[timeframe]
+
+    def _close_position(self, position, exit_price):
+        """Uzavře pozici za `exit_price`, zaúčtuje zisk a uloží detail obchodu."""
+        if position["type"] == "long":
+            profit = (exit_price - position["entry_price"]) * position["size"]
+        else:
+            profit = (position["entry_price"] - exit_price) * position["size"]
+
+        self.trade_details.append((1 if position["type"] == "long" else -1, position["entry_price"], exit_price, position["size"], self.balance))
+        self.balance += profit
+        self.trades.append(profit)
+        self.positions.remove(position)
+        return profit
+
+    def trade_arrays(self):
+        """Vrátí uzavřené obchody jako NumPy pole (směr, ceny, velikost, kapitál před obchodem, zisk a výnos)."""
+        details = np.array(self.trade_details, dtype=float).reshape(-1, 5)
+        profit = np.array(self.trades, dtype=float)
+        return {
+            "side": details[:, 0],
+            "entry_price": details[:, 1],
+            "exit_price": details[:, 2],
+            "size": details[:, 3],
+            "balance_before": details[:, 4],
+            "profit": profit,
+            "return": profit / details[:, 4],  # Výnos obchodu vůči kapitálu, ze kterého byla pozice otevřena
+        }
+
+    def _record_candle(self):
+        """Aktualizuje drawdown a historii kapitálu po zpracování svíčky (konstantní paměť)."""
+        self.num_candles += 1
 
-        self.log_debug(f"[bold yellow]DEBUG: Spouštím backtest pro {symbol} ({timeframe}) na {self.num_candles} svíčkách...[/bold yellow]")
+        self.max_balance = max(self.max_balance, self.balance)
+        drawdown = (self.max_balance - self.balance) / self.max_balance * 100
+        self.max_drawdown = max(self.max_drawdown, drawdown)
 
-        for i in range(len(data)):
-            row = data.iloc[i]
+        if self.candles_per_year and self.num_candles == int((len(self.yearly_balances) + 1) * self.candles_per_year):
+            self.yearly_balances.append(self.balance)
+
+        if self.num_candles % self.history_stride == 0:
+            self.capital_history.append(self.balance)  # Uložení stavu kapitálu
+
+            # Při zaplnění ponecháme každý druhý bod a zdvojnásobíme krok
+            if len(self.capital_history) > MAX_CHART_POINTS:
+                self.capital_history = self.capital_history[::2]
+                self.history_stride *= 2
+
+    def _process_signals(self, signals: Signals):
+        """Projde pole signálů svíčku po svíčce a obchoduje podle nich."""
+        # Převod na Python seznamy – indexace je řádově rychlejší než u DataFrame.iloc
+        close = signals.close.tolist()
+        long_signal = signals.long_signal.tolist()
+        short_signal = signals.short_signal.tolist()
+        close_long_signal = signals.close_long_signal.tolist()
+        close_short_signal = signals.close_short_signal.tolist()
+        long_stop_loss = signals.long_stop_loss_price.tolist()
+        short_stop_loss = signals.short_stop_loss_price.tolist()
+        long_take_profit = signals.long_take_profit_price.tolist()
+        short_take_profit = signals.short_take_profit_price.tolist()
+        long_trailing_stop = signals.long_trailing_stop_price.tolist()
+        short_trailing_stop = signals.short_trailing_stop_price.tolist()
+
+        for i in range(len(signals)):
+            price = close[i]
 
             # Výpočet drawdownu a úprava risku
             adjusted_risk = self.strategy.adjust_risk_based_on_drawdown(self.balance, self.max_balance)
 
             # Otevření LONG pozice
-            if row["long_signal"] and not self.positions:
-                position_size, _ = self.strategy.calculate_position_size(self.balance, row["close"], row["long_stop_loss_price"], self.max_balance)
+            if long_signal[i] and not self.positions:
+                position_size, _ = self.strategy.calculate_position_size(self.balance, price, long_stop_loss[i], self.max_balance)
 
-                self.log_debug(f"[green]DEBUG: Otevření LONG pozice za {row['close']}, Velikost pozice: {position_size}, Risk: {adjusted_risk:.2%}[/green]")
+                self.log_debug(f"[green]DEBUG: Otevření LONG pozice za {price}, Velikost pozice: {position_size}, Risk: {adjusted_risk:.2%}[/green]")
 
                 self.positions.append({
                     "type": "long",
-                    "entry_price": row["close"],
-                    "stop_loss": row["long_stop_loss_price"],
-                    "take_profit": row["long_take_profit_price"],
-                    "trailing_stop": row["long_trailing_stop_price"],
+                    "entry_price": price,
+                    "stop_loss": long_stop_loss[i],
+                    "take_profit": long_take_profit[i],
+                    "trailing_stop": long_trailing_stop[i],
                     "size": position_size
                 })
             # Otevření SHORT pozice
-            if row["short_signal"] and not self.positions:
-                position_size = row["short_position_size"]
-                stop_loss_price = row["short_stop_loss_price"]
+            if short_signal[i] and not self.positions:
+                stop_loss_price = short_stop_loss[i]
+                position_size, _ = self.strategy.calculate_position_size(self.balance, price, stop_loss_price, self.max_balance)
 
-                self.log_debug(f"[red]DEBUG: Otevření SHORT pozice za {row['close']}, Velikost pozice: {position_size}, SL: {stop_loss_price}[/red]")
+                self.log_debug(f"[red]DEBUG: Otevření SHORT pozice za {price}, Velikost pozice: {position_size}, SL: {stop_loss_price}[/red]")
 
                 self.positions.append({
                     "type": "short",
-                    "entry_price": row["close"],
+                    "entry_price": price,
                     "stop_loss": stop_loss_price,
-                    "take_profit": row["short_take_profit_price"],
-                    "trailing_stop": row["short_trailing_stop_price"],
+                    "take_profit": short_take_profit[i],
+                    "trailing_stop": short_trailing_stop[i],
                     "size": position_size
                 })
 
             for position in self.positions[:]:  # Kopie seznamu, aby nedošlo k chybě při mazání
                 if position["type"] == "long":
-                    if row["close"] <= position["stop_loss"]:
-                        profit = (position["stop_loss"] - position["entry_price"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[red]DEBUG: SL uzavřel LONG za {row['close']}, Profit: {profit}[/red]")
-
-                    elif row["close"] >= position["take_profit"]:
-                        profit = (position["take_profit"] - position["entry_price"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[green]DEBUG: TP uzavřel LONG za {row['close']}, Profit: {profit}[/green]")
-
-                    elif row["close"] < position["trailing_stop"]:
-                        profit = (position["trailing_stop"] - position["entry_price"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[cyan]DEBUG: TS uzavřel LONG za {row['close']}, Profit: {profit}[/cyan]")
-
-                    elif row["close_long_signal"]:
-                        profit = (row["close"] - position["entry_price"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[yellow]DEBUG: RSI exit uzavřel LONG za {row['close']}, Profit: {profit}[/yellow]")
+                    if price <= position["stop_loss"]:
+                        profit = self._close_position(position, position["stop_loss"])
+                        self.log_debug(f"[red]DEBUG: SL uzavřel LONG za {price}, Profit: {profit}[/red]")
+
+                    elif price >= position["take_profit"]:
+                        profit = self._close_position(position, position["take_profit"])
+                        self.log_debug(f"[green]DEBUG: TP uzavřel LONG za {price}, Profit: {profit}[/green]")
+
+                    elif price < position["trailing_stop"]:
+                        profit = self._close_position(position, position["trailing_stop"])
+                        self.log_debug(f"[cyan]DEBUG: TS uzavřel LONG za {price}, Profit: {profit}[/cyan]")
+
+                    elif close_long_signal[i]:
+                        profit = self._close_position(position, price)
+                        self.log_debug(f"[yellow]DEBUG: Signál uzavřel LONG za {price}, Profit: {profit}[/yellow]")
 
                 elif position["type"] == "short":
-                    if row["close"] >= position["stop_loss"]:
-                        profit = (position["entry_price"] - position["stop_loss"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[red]DEBUG: SL uzavřel SHORT za {row['close']}, Profit: {profit}[/red]")
-
-                    elif row["close"] <= position["take_profit"]:
-                        profit = (position["entry_price"] - position["take_profit"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[green]DEBUG: TP uzavřel SHORT za {row['close']}, Profit: {profit}[/green]")
-
-                    elif row["close"] > position["trailing_stop"]:
-                        profit = (position["entry_price"] - position["trailing_stop"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[cyan]DEBUG: TS uzavřel SHORT za {row['close']}, Profit: {profit}[/cyan]")
-
-                    elif row["close_short_signal"]:
-                        profit = (position["entry_price"] - row["close"]) * position["size"]
-                        self.balance += profit
-                        self.trades.append(profit)
-                        self.positions.remove(position)
-                        self.log_debug(f"[yellow]DEBUG: RSI exit uzavřel SHORT za {row['close']}, Profit: {profit}[/yellow]")
-        
-            # Aktualizace max balance a drawdownu
-            self.max_balance = max(self.max_balance, self.balance)
-            drawdown = (self.max_balance - self.balance) / self.max_balance * 100
-            self.drawdowns.append(drawdown)
+                    if price >= position["stop_loss"]:
+                        profit = self._close_position(position, position["stop_loss"])
+                        self.log_debug(f"[red]DEBUG: SL uzavřel SHORT za {price}, Profit: {profit}[/red]")
 
-            self.capital_history.append(self.balance)  # Uložení stavu kapitálu
+                    elif price <= position["take_profit"]:
+                        profit = self._close_position(position, position["take_profit"])
+                        self.log_debug(f"[green]DEBUG: TP uzavřel SHORT za {price}, Profit: {profit}[/green]")
 
-        timeframe_to_minutes = {
-            "1m": 1, "3m": 3, "5m": 5, "15m": 15, "30m": 30,
-            "1h": 60, "2h": 120, "4h": 240, "6h": 360, "12h": 720,
-            "1d": 1440, "1w": 10080, "1M": 43200
-        }
+                    elif price > position["trailing_stop"]:
+                        profit = self._close_position(position, position["trailing_stop"])
+                        self.log_debug(f"[cyan]DEBUG: TS uzavřel SHORT za {price}, Profit: {profit}[/cyan]")
 
-        if timeframe in timeframe_to_minutes:
-            total_minutes = self.num_candles * timeframe_to_minutes[timeframe]
+                    elif close_short_signal[i]:
+                        profit = self._close_position(position, price)
+                        self.log_debug(f"[yellow]DEBUG: Signál uzavřel SHORT za {price}, Profit: {profit}[/yellow]")
+
+            # Aktualizace max balance, drawdownu a historie kapitálu
+            self._record_candle()
+
+    def _summarize(self, symbol, timeframe):
+        """Spočítá metriky backtestu, vykreslí graf kapitálu a vrátí výsledky."""
+        if timeframe in TIMEFRAME_TO_MINUTES:
+            total_minutes = self.num_candles * TIMEFRAME_TO_MINUTES[timeframe]
 
             years = total_minutes // (60 * 24 * 365)
             days = (total_minutes % (60 * 24 * 365)) // (60 * 24)
@@ -174,17 +244,11 @@ class Backtest:
         total_wins = len([p for p in self.trades if p > 0])
         total_losses = len([p for p in self.trades if p < 0])
         win_rate = total_wins / max(1, len(self.trades))
-        max_drawdown = max(self.drawdowns) if self.drawdowns else 0
+        max_drawdown = self.max_drawdown
 
         # **📌 Opravený výpočet ročního výnosu – zprůměrovaný CAGR**
         if test_years and test_years >= 1:
-            yearly_balances = []
-            num_years = int(test_years)
-
-            for year in range(1, num_years + 1):
-                index = int(year * (self.num_candles / test_years))
-                if index < len(self.capital_history):
-                    yearly_balances.append(self.capital_history[index])
+            yearly_balances = self.yearly_balances[:int(test_years)]
 
             if len(yearly_balances) > 1:
                 annual_returns = [
@@ -212,7 +276,8 @@ class Backtest:
         # Generování grafu vývoje kapitálu
         console.print("📈 [bold cyan]Generuji graf kapitálu...[/bold cyan]")
         plt.figure(figsize=(10, 5))
-        plt.plot(self.capital_history, label="Kapitál", color="blue")
+        candle_index = np.arange(len(self.capital_history)) * self.history_stride
+        plt.plot(candle_index, self.capital_history, label="Kapitál", color="blue")
         plt.xlabel("Počet svíček")
         plt.ylabel("Hodnota kapitálu")
         plt.title(f"Vývoj kapitálu během backtestu ({symbol}, {timeframe})")
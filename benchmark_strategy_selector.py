@@ -0,0 +1,61 @@
+import time
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+from strategy_selector import StrategySelector
+
+console = Console()
+
+def generate_candles(num_candles, seed=0):
+    """Vygeneruje syntetické svíčky (náhodná procházka) – benchmark nepotřebuje burzu."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, num_candles)))
+    high = close * (1 + np.abs(rng.normal(0, 0.004, num_candles)))
+    low = close * (1 - np.abs(rng.normal(0, 0.004, num_candles)))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2020-01-01", periods=num_candles, freq="h"),
+        "open": np.r_[close[0], close[:-1]],
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.random(num_candles),
+    })
+
+def benchmark_batch(selector, data):
+    """Režim pro celý dataset najednou (backtest) – vrací µs na svíčku."""
+    start = time.perf_counter()
+    selector.create_tracker().update(data)
+    return (time.perf_counter() - start) / len(data) * 1e6
+
+def benchmark_incremental(selector, data, warmup=500):
+    """Zahřátí nad historií a pak po jedné svíčce (živý bot) – vrací µs na svíčku."""
+    tracker = selector.create_tracker()
+    tracker.update(data.iloc[:warmup])
+
+    candles = [data.iloc[i:i + 1] for i in range(warmup, len(data))]
+    start = time.perf_counter()
+    for candle in candles:
+        tracker.update(candle)
+    return (time.perf_counter() - start) / len(candles) * 1e6
+
+def benchmark_recompute(selector, data, window=500, repeats=200):
+    """Původní přístup: přepočet rysů nad posledními `window` svíčkami pro každé rozhodnutí."""
+    start = time.perf_counter()
+    for i in range(repeats):
+        selector.select_strategy(data.iloc[i:i + window])
+    return (time.perf_counter() - start) / repeats * 1e6
+
+if __name__ == "__main__":
+    selector = StrategySelector()
+    data = generate_candles(200_000)
+
+    table = Table(title="Režie výběru strategie", show_header=True, header_style="bold magenta")
+    table.add_column("Režim", style="bold cyan")
+    table.add_column("µs / svíčka", justify="right")
+
+    table.add_row("Dávkově (backtest, 200 000 svíček)", f"{benchmark_batch(selector, data):.2f}")
+    table.add_row("Inkrementálně (živý bot, 2 000 svíček)", f"{benchmark_incremental(selector, data.iloc[:2500]):.2f}")
+    table.add_row("Přepočet okna 500 svíček na rozhodnutí", f"{benchmark_recompute(selector, data):.2f}")
+
+    console.print(table)
@@ -1,26 +1,59 @@
-from mean_reversion import MeanReversion
-from exchange import Exchange
+import time
+import pandas as pd
+import exchange
+from strategy_selector import REGIME_NAMES, RegimeSwitching
 
 class TradingBot:
-    def __init__(self):
-        self.exchange = Exchange()
-        self.strategy = MeanReversion()
+    def __init__(self, warmup_candles=500):
+        self.strategy = RegimeSwitching()
+        self.warmup_candles = warmup_candles  # Počet svíček pro zahřátí indikátorů a rysů režimu
+        self.indicators = None
+        self.last_timestamp = None
 
-    def run(self, symbol="BTCUSDT", timeframe="1h"):
-        """Spustí živé obchodování."""
-        historical_data = self.exchange.get_historical_data(symbol, timeframe, 100)
-        df = pd.DataFrame(historical_data)
-        df["signal"] = self.strategy.generate_signals(df)
+    def run(self, symbol="BTC/USDT", timeframe="1h"):
+        """Spustí živé obchodování – zpracuje svíčky uzavřené od posledního volání."""
+        if self.indicators is None:
+            # První běh: rysy režimu a indikátory se spočítají jednou nad historií
+            self.indicators = self.strategy.create_indicators()
+            candles = exchange.get_historical_data(symbol, timeframe, self.warmup_candles)
+        else:
+            # Stáhneme všechny svíčky od poslední zpracované (+ rozpracovanou), ať jich uplynulo kolik chce
+            period = pd.Timedelta(seconds=exchange.exchange.parse_timeframe(timeframe))
+            elapsed = pd.Timestamp.now(tz="UTC").tz_localize(None) - self.last_timestamp
+            candles = exchange.get_historical_data(symbol, timeframe, int(elapsed / period) + 2)
+            candles = candles[candles["timestamp"] > self.last_timestamp]
 
-        latest_signal = df["signal"].iloc[-1]
+            # Mezera v datech by rozbila stav indikátorů (počítají se souvislé svíčky) → nové zahřátí
+            if not candles.empty and candles["timestamp"].iloc[0] != self.last_timestamp + period:
+                print(f"[BOT] Chybí svíčky po {self.last_timestamp}, znovu zahřívám indikátory")
+                self.indicators = None
+                return self.run(symbol, timeframe)
 
-        if latest_signal == "BUY":
-            print("[BOT] Odesílám BUY objednávku")
+        candles = candles.iloc[:-1]  # Poslední svíčka ještě není uzavřená
+        if candles.empty:
+            return
+
+        # Inkrementální aktualizace – přepočítávají se jen nové svíčky
+        signals = self.strategy.compute_signals(candles, self.indicators)
+        self.last_timestamp = candles["timestamp"].iloc[-1]
+        regime = REGIME_NAMES[self.indicators["regime"].regime]
+
+        if signals.long_signal[-1]:
+            print(f"[BOT] Režim {regime}: Odesílám BUY objednávku")
             # execution.send_order("BUY", symbol)
 
-        elif latest_signal == "SELL":
-            print("[BOT] Odesílám SELL objednávku")
+        elif signals.short_signal[-1]:
+            print(f"[BOT] Režim {regime}: Odesílám SELL objednávku")
             # execution.send_order("SELL", symbol)
 
-bot = TradingBot()
-bot.run()
+    def seconds_until_next_candle(self, timeframe="1h"):
+        """Vrátí počet sekund do uzavření aktuální svíčky (s malou rezervou pro burzu)."""
+        period = exchange.exchange.parse_timeframe(timeframe)
+        return period - time.time() % period + 5
+
+if __name__ == "__main__":
+    bot = TradingBot()
+    # Stejná instance běží dál – rysy režimu se po zahřátí jen inkrementálně aktualizují
+    while True:
+        bot.run()
+        time.sleep(bot.seconds_until_next_candle())
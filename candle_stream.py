@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+CANDLE_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def iter_dataframe_chunks(data: pd.DataFrame, chunk_size: int = 100_000):
+    """Rozdělí DataFrame svíček na po sobě jdoucí dávky o velikosti `chunk_size`."""
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start:start + chunk_size]
+
+
+def iter_csv_chunks(path: str, chunk_size: int = 100_000):
+    """Čte svíčky z CSV (sloupce jako `exchange.get_historical_data`) po dávkách."""
+    for chunk in pd.read_csv(path, chunksize=chunk_size, parse_dates=["timestamp"], float_precision="round_trip"):
+        yield chunk
+
+
+def save_candles(data: pd.DataFrame, path: str):
+    """
+    Uloží svíčky do .npy souboru se strukturovaným polem pro `iter_memmap_chunks()`.
+
+    :param data: DataFrame se sloupci timestamp, open, high, low, close, volume
+    :param path: Cílový soubor (.npy)
+    """
+    candles = np.empty(len(data), dtype=[("timestamp", "datetime64[ms]")] + [(column, "f8") for column in CANDLE_COLUMNS[1:]])
+    for column in CANDLE_COLUMNS:
+        candles[column] = data[column].to_numpy()
+    np.save(path, candles)
+
+
+def iter_memmap_chunks(path: str, chunk_size: int = 100_000):
+    """Čte svíčky z .npy souboru přes memory-map – v paměti je vždy jen jedna dávka."""
+    candles = np.load(path, mmap_mode="r")
+    for start in range(0, len(candles), chunk_size):
+        chunk = candles[start:start + chunk_size]
+        yield pd.DataFrame({column: np.array(chunk[column]) for column in CANDLE_COLUMNS})
@@ -2,6 +2,7 @@ import sys
 import exchange
 from mean_reversion import MeanReversion
 from trend_following import TrendFollowing
+from strategy_selector import RegimeSwitching
 from backtest import Backtest
 from optimalization import optimize_strategy
 from rich.console import Console
@@ -43,13 +44,14 @@ def backtest_menu():
 
         console.print("[1] 🔄 Spustit Backtest Mean Reversion", style="bold green")
         console.print("[2] 🔄 Spustit Backtest Trend Following", style="bold blue")
-        console.print("[3] 🔙 Zpět na hlavní menu", style="bold red")
+        console.print("[3] 🔄 Spustit Backtest Regime Switching", style="bold magenta")
+        console.print("[4] 🔙 Zpět na hlavní menu", style="bold red")
 
-        choice = Prompt.ask("\nVyber možnost", choices=["1", "2", "3"])
+        choice = Prompt.ask("\nVyber možnost", choices=["1", "2", "3", "4"])
 
-        if choice in ["1", "2"]:
-            run_backtest("mean_reversion" if choice == "1" else "trend_following")
-        elif choice == "3":
+        if choice in ["1", "2", "3"]:
+            run_backtest({"1": "mean_reversion", "2": "trend_following", "3": "regime_switching"}[choice])
+        elif choice == "4":
             return
 
 def run_backtest(strategy_name):
@@ -62,7 +64,8 @@ def run_backtest(strategy_name):
     candles = int(Prompt.ask("Kolik svíček stáhnout?", default="1000"))
     initial_balance = float(Prompt.ask("Zadej počáteční kapitál", default="10000"))
 
-    strategy = MeanReversion() if strategy_name == "mean_reversion" else TrendFollowing()
+    strategies = {"mean_reversion": MeanReversion, "trend_following": TrendFollowing, "regime_switching": RegimeSwitching}
+    strategy = strategies[strategy_name]()
     backtest = Backtest(strategy, initial_balance)
 
     exchange_client = exchange  # Použití exchange.py pro stažení historických dat
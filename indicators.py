@@ -0,0 +1,272 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Do této velikosti dávky (typicky nové svíčky v živém botovi) se počítá v čistém Pythonu,
+# režie NumPy/pandas volání by jinak převážila samotný výpočet. Pořadí operací je v obou
+# cestách stejné, výsledky jsou tedy bitově shodné.
+SMALL_UPDATE = 8
+
+
+class RollingMean:
+    """
+    Klouzavý průměr z průběžného kumulativního součtu – každá nová svíčka stojí O(1).
+
+    Průměr je rozdíl dvou kumulativních součtů. Součet se přenáší mezi dávkami
+    a sčítá se vždy zleva doprava (`np.cumsum` i smyčka pro malé dávky), takže
+    výsledek nezávisí na tom, kde dávka začíná. NaN hodnoty se počítají zvlášť
+    a průměr okna, které nějakou obsahuje, je NaN.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        # Kumulativní součty a počty NaN za posledních `window` svíček (NaN = před začátkem historie)
+        self._sums = deque([np.nan] * (window - 1) + [0.0], maxlen=window)
+        self._nan_counts = deque([np.nan] * (window - 1) + [0.0], maxlen=window)
+
+    def update(self, values):
+        """Vrátí průměr pro každou hodnotu dávky (NaN, dokud není okno plné)."""
+        values = np.asarray(values, dtype=float)
+        if len(values) <= SMALL_UPDATE:
+            return np.array([self._update_one(value) for value in values.tolist()])
+
+        is_nan = np.isnan(values)
+        sums = np.cumsum(np.concatenate([[self._sums[-1]], np.where(is_nan, 0.0, values)]))[1:]
+        nan_counts = np.cumsum(np.concatenate([[self._nan_counts[-1]], is_nan]))[1:]
+
+        all_sums = np.concatenate([np.array(self._sums), sums])
+        all_nan_counts = np.concatenate([np.array(self._nan_counts), nan_counts])
+        window_nans = all_nan_counts[self.window:] - all_nan_counts[:len(values)]
+        result = (all_sums[self.window:] - all_sums[:len(values)]) / self.window
+
+        self._sums.extend(all_sums[-self.window:].tolist())
+        self._nan_counts.extend(all_nan_counts[-self.window:].tolist())
+        return np.where(window_nans > 0, np.nan, result)
+
+    def _update_one(self, value):
+        is_nan = value != value
+        total = self._sums[-1] + (0.0 if is_nan else value)
+        nan_count = self._nan_counts[-1] + is_nan
+
+        # Nejstarší prvek deque je součet těsně před začátkem okna
+        window_sum = total - self._sums[0]
+        window_nans = nan_count - self._nan_counts[0]
+        self._sums.append(total)
+        self._nan_counts.append(nan_count)
+        return np.nan if window_nans > 0 else window_sum / self.window
+
+
+class RollingMax:
+    """Klouzavé maximum přes posledních `window` hodnot, stav se přenáší mezi dávkami."""
+
+    reduce = staticmethod(np.maximum.reduce)
+
+    def __init__(self, window):
+        self.window = window
+        self._tail = np.empty(0)
+
+    def update(self, values):
+        """Vrátí extrém pro každou hodnotu dávky (NaN, dokud není okno plné)."""
+        values = np.asarray(values, dtype=float)
+        buffer = np.concatenate([self._tail, values])
+        result = np.full(len(values), np.nan)
+
+        if len(buffer) >= self.window:
+            windows = np.lib.stride_tricks.sliding_window_view(buffer, self.window)
+            extremes = self.reduce(windows, axis=1)
+            result[len(values) - len(extremes):] = extremes
+
+        self._tail = buffer[max(len(buffer) - self.window + 1, 0):] if self.window > 1 else buffer[:0]
+        return result
+
+
+class RollingMin(RollingMax):
+    """Klouzavé minimum přes posledních `window` hodnot, stav se přenáší mezi dávkami."""
+
+    reduce = staticmethod(np.minimum.reduce)
+
+
+class Shift:
+    """Posun řady o `periods` svíček dozadu (ekvivalent `Series.shift(periods)`)."""
+
+    def __init__(self, periods=1):
+        self.periods = periods
+        self._last = np.full(periods, np.nan)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        buffer = np.concatenate([self._last, values])
+        self._last = buffer[len(buffer) - self.periods:]
+        return buffer[:len(values)]
+
+
+class WilderMA:
+    """Wilderovo vyhlazení (EWM s alpha = 1 / window, adjust=False), stav se přenáší mezi dávkami."""
+
+    def __init__(self, window=14):
+        self.window = window
+        self._last = None
+
+    def update(self, values):
+        """Vrátí vyhlazené hodnoty dávky (bez maskování zahřívání)."""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return values
+
+        if len(values) <= SMALL_UPDATE:
+            smoothed = np.array(self._update_small(values.tolist()))
+        else:
+            # Předřazením posledního vyhlazeného stavu pokračuje EWM přesně tam, kde skončila minulá dávka
+            if self._last is not None:
+                values = np.concatenate([[self._last], values])
+            smoothed = pd.Series(values).ewm(alpha=1 / self.window, adjust=False).mean().to_numpy(copy=True)
+            if self._last is not None:
+                smoothed = smoothed[1:]
+
+        self._last = smoothed[-1]
+        return smoothed
+
+    def _update_small(self, values):
+        """Stejná rekurze jako `Series.ewm(alpha, adjust=False).mean()` pro pár hodnot."""
+        # pandas převádí alpha přes center of mass, proto stejný převod i zde
+        alpha = 1.0 / (1.0 + (1 - 1 / self.window) / (1 / self.window))
+        old_weight = 1.0 - alpha
+
+        smoothed = []
+        weighted = self._last
+        for value in values:
+            if weighted is None:
+                weighted = value
+            elif weighted != value:
+                weighted = (old_weight * weighted + alpha * value) / (old_weight + alpha)
+            smoothed.append(weighted)
+        return smoothed
+
+
+class RSI:
+    """RSI (Wilderovo vyhlazení) shodné s `ta.momentum.RSIIndicator`, počítané po dávkách."""
+
+    def __init__(self, window=14):
+        self.window = window
+        self._prev_close = np.nan
+        self._ema_up = WilderMA(window)
+        self._ema_down = WilderMA(window)
+        self._count = 0
+
+    def update(self, close):
+        """Vrátí RSI pro každou zavírací cenu dávky."""
+        close = np.asarray(close, dtype=float)
+        if len(close) == 0:
+            return close
+
+        diff = np.diff(close, prepend=self._prev_close)
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+
+        ema_up = self._ema_up.update(up)
+        ema_down = self._ema_down.update(down)
+        self._prev_close = close[-1]
+
+        # Prvních `window - 1` svíček je zahřívání indikátoru
+        warmup = np.arange(self._count, self._count + len(close)) < self.window - 1
+        ema_up[warmup] = np.nan
+        ema_down[warmup] = np.nan
+        self._count += len(close)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ema_down == 0, 100, 100 - (100 / (1 + ema_up / ema_down)))
+
+
+class ATR:
+    """Average True Range shodné s `ta.volatility.AverageTrueRange`, počítané po dávkách."""
+
+    def __init__(self, window=14):
+        self.window = window
+        self._prev_close = np.nan
+        self._atr = 0.0
+        self._first_ranges = []  # True range prvních svíček pro počáteční průměr
+        self._count = 0
+
+    def update(self, high, low, close):
+        """Vrátí ATR pro každou svíčku dávky (během zahřívání 0 jako v knihovně `ta`)."""
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        close = np.asarray(close, dtype=float)
+        if len(close) == 0:
+            return close
+
+        prev_close = np.concatenate([[self._prev_close], close[:-1]])
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+        atr = np.zeros(len(close))
+        atr_value = self._atr
+        for i, tr in enumerate(true_range.tolist()):
+            index = self._count + i
+            if index < self.window:
+                self._first_ranges.append(tr)
+                if index == self.window - 1:
+                    atr_value = np.asarray(self._first_ranges).sum() / self.window
+                    self._first_ranges = []
+                else:
+                    continue
+            else:
+                atr_value = (atr_value * (self.window - 1) + tr) / float(self.window)
+            atr[i] = atr_value
+
+        self._atr = atr_value
+        self._prev_close = close[-1]
+        self._count += len(close)
+        return atr
+
+
+class ADX:
+    """Average Directional Index (Wilder), počítaný po dávkách se stavem mezi nimi."""
+
+    def __init__(self, window=14):
+        self.window = window
+        self._prev_high = np.nan
+        self._prev_low = np.nan
+        self._prev_close = np.nan
+        self._true_range = WilderMA(window)
+        self._plus_dm = WilderMA(window)
+        self._minus_dm = WilderMA(window)
+        self._adx = WilderMA(window)
+        self._count = 0
+
+    def update(self, high, low, close):
+        """Vrátí ADX pro každou svíčku dávky (NaN během prvních `2 * window - 1` svíček)."""
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        close = np.asarray(close, dtype=float)
+        if len(close) == 0:
+            return close
+
+        prev_high = np.concatenate([[self._prev_high], high[:-1]])
+        prev_low = np.concatenate([[self._prev_low], low[:-1]])
+        prev_close = np.concatenate([[self._prev_close], close[:-1]])
+
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+        smoothed_tr = self._true_range.update(true_range)
+        smoothed_plus = self._plus_dm.update(plus_dm)
+        smoothed_minus = self._minus_dm.update(minus_dm)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            plus_di = np.where(smoothed_tr > 0, 100 * smoothed_plus / smoothed_tr, 0.0)
+            minus_di = np.where(smoothed_tr > 0, 100 * smoothed_minus / smoothed_tr, 0.0)
+            di_sum = plus_di + minus_di
+            dx = np.where(di_sum > 0, 100 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+
+        adx = self._adx.update(dx)
+        adx[np.arange(self._count, self._count + len(close)) < 2 * self.window - 1] = np.nan
+
+        self._prev_high = high[-1]
+        self._prev_low = low[-1]
+        self._prev_close = close[-1]
+        self._count += len(close)
+        return adx
@@ -3,6 +3,7 @@ import exchange
 import os
 import numpy as np
 from backtest import Backtest
+from robustness import METHODS, run_robustness_analysis
 from mean_reversion import MeanReversion
 from trend_following import TrendFollowing
 from rich.console import Console
@@ -25,6 +26,19 @@ def log_optimization_results(best_params, avg_score, strategy_name, symbol, time
             f.write(f"🔹 {param}: {value}\n")
         f.write(f"\n📈 Průměrný dosažený kapitál na testovacích datech: ${avg_score:.2f}\n")
 
+def log_robustness_results(robustness):
+    """Připíše pásma Monte Carlo analýzy robustnosti do logu optimalizace."""
+    method_names = {"shuffle": "Náhodné pořadí obchodů", "bootstrap": "Bootstrap obchodů", "costs": "Skluz a poplatky"}
+
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write("\n=== MONTE CARLO ROBUSTNOST (nejlepší parametry, testovací data) ===\n")
+        for method in METHODS:
+            bands = robustness[method]
+            f.write(f"🎲 {method_names[method]}:\n")
+            f.write(f"🔹 Konečný kapitál: ${bands['final_balance']['low']:.2f} – ${bands['final_balance']['high']:.2f} (medián ${bands['final_balance']['median']:.2f})\n")
+            f.write(f"🔹 Max Drawdown: {bands['max_drawdown']['low']:.2f}% – {bands['max_drawdown']['high']:.2f}% (medián {bands['max_drawdown']['median']:.2f}%)\n")
+            f.write(f"🔹 Sharpe Ratio: {bands['sharpe_ratio']['low']:.2f} – {bands['sharpe_ratio']['high']:.2f} (medián {bands['sharpe_ratio']['median']:.2f})\n")
+
 def split_data(historical_data, n_splits=5, train_ratio=0.7):
     """Rozdělí dataset na tréninkové a testovací části."""
     split_size = len(historical_data) // n_splits
@@ -45,28 +59,46 @@ def split_data(historical_data, n_splits=5, train_ratio=0.7):
 
     return splits
 
-def objective(trial, strategy_name, train_data, initial_balance, symbol, timeframe):
-    """Optimalizační funkce pro Optuna."""
-
-    take_profit = trial.suggest_float("take_profit", 0.5, 5.0)
-    stop_loss = trial.suggest_float("stop_loss", 0.5, 5.0)
-    trailing_stop = trial.suggest_float("trailing_stop", 0.5, 5.0)
-    risk_per_trade = trial.suggest_float("risk_per_trade", 0.01, 0.05)
-    atr_multiplier = trial.suggest_float("atr_multiplier", 1.0, 3.0)
-
+def build_strategy(strategy_name, params):
+    """Vytvoří strategii z parametrů nalezených Optunou."""
     if strategy_name == "mean_reversion":
-        strategy = MeanReversion(
+        return MeanReversion(
             rsi_period=14,
             rsi_overbought=70,
             rsi_oversold=30,
-            stop_loss=stop_loss / 100,
-            take_profit=take_profit / 100,
-            trailing_stop=trailing_stop / 100,
-            risk_per_trade=risk_per_trade,
-            atr_multiplier=atr_multiplier
+            stop_loss=params["stop_loss"] / 100,
+            take_profit=params["take_profit"] / 100,
+            trailing_stop=params["trailing_stop"] / 100,
+            risk_per_trade=params["risk_per_trade"],
+            atr_multiplier=params["atr_multiplier"]
         )
+
+    return TrendFollowing(
+        fast_period=params["fast_period"],
+        slow_period=params["slow_period"],
+        breakout_period=params["breakout_period"],
+        take_profit=params["take_profit"] / 100,
+        trailing_stop=params["trailing_stop"] / 100,
+        risk_per_trade=params["risk_per_trade"],
+        atr_multiplier=params["atr_multiplier"]
+    )
+
+def objective(trial, strategy_name, train_data, initial_balance, symbol, timeframe):
+    """Optimalizační funkce pro Optuna."""
+
+    trial.suggest_float("take_profit", 0.5, 5.0)
+    trial.suggest_float("trailing_stop", 0.5, 5.0)
+    trial.suggest_float("risk_per_trade", 0.01, 0.05)
+    trial.suggest_float("atr_multiplier", 1.0, 3.0)
+
+    if strategy_name == "mean_reversion":
+        trial.suggest_float("stop_loss", 0.5, 5.0)
     else:
-        strategy = TrendFollowing(take_profit, stop_loss, trailing_stop)
+        trial.suggest_int("fast_period", 5, 30)
+        trial.suggest_int("slow_period", 40, 200)
+        trial.suggest_int("breakout_period", 10, 60)
+
+    strategy = build_strategy(strategy_name, trial.params)
 
     backtest = Backtest(strategy, initial_balance)
     results = backtest.run(train_data.copy(), symbol, timeframe)
@@ -85,6 +117,7 @@ def optimize_strategy(strategy_name, symbol, timeframe, candles, initial_balance
 
     all_scores = []
     best_params = {}
+    best_trades = None  # Obchody nejlepších parametrů na jejich testovacích datech
 
     for i, (train_data, test_data) in enumerate(splits):
         console.print(f"[bold yellow]🔄 Walk-forward segment {i+1}/{len(splits)}...[/bold yellow]")
@@ -96,19 +129,7 @@ def optimize_strategy(strategy_name, symbol, timeframe, candles, initial_balance
         segment_score = study.best_value
 
         # Otestování na testovacích datech
-        if strategy_name == "mean_reversion":
-            strategy = MeanReversion(
-                rsi_period=14,
-                rsi_overbought=70,
-                rsi_oversold=30,
-                stop_loss=segment_params["stop_loss"] / 100,
-                take_profit=segment_params["take_profit"] / 100,
-                trailing_stop=segment_params["trailing_stop"] / 100,
-                risk_per_trade=segment_params["risk_per_trade"],
-                atr_multiplier=segment_params["atr_multiplier"]
-            )
-        else:
-            strategy = TrendFollowing(segment_params["take_profit"], segment_params["stop_loss"], segment_params["trailing_stop"])
+        strategy = build_strategy(strategy_name, segment_params)
 
         backtest = Backtest(strategy, initial_balance)
         test_results = backtest.run(test_data.copy(), symbol, timeframe)
@@ -118,6 +139,7 @@ def optimize_strategy(strategy_name, symbol, timeframe, candles, initial_balance
 
         if not best_params or test_score > max(all_scores[:-1], default=0):  
             best_params = segment_params  
+            best_trades = backtest.trade_arrays()
 
         console.print(f"[bold green]✅ Segment {i+1} - Testovací kapitál: ${test_score:.2f}[/bold green]")
 
@@ -128,4 +150,14 @@ def optimize_strategy(strategy_name, symbol, timeframe, candles, initial_balance
     console.print("[bold green]✅ Walk-forward optimalizace dokončena![/bold green]")
     console.print(f"🏆 Průměrný kapitál na testovacích datech: ${avg_score:.2f}")
 
+    # Monte Carlo ověření, zda nejlepší parametry nejsou jen šťastná náhoda
+    robustness = run_robustness_analysis(best_trades, initial_balance) if best_trades is not None else None
+    if robustness:
+        log_robustness_results(robustness)
+        bands = robustness["bootstrap"]
+        console.print(f"🎲 Robustnost (bootstrap, 90 %): kapitál ${bands['final_balance']['low']:.2f} – ${bands['final_balance']['high']:.2f}, "
+                      f"Max DD {bands['max_drawdown']['low']:.2f}% – {bands['max_drawdown']['high']:.2f}%")
+    else:
+        console.print("[bold red]⚠️ Nejlepší parametry neprovedly na testovacích datech žádný obchod – analýza robustnosti přeskočena.[/bold red]")
+
     return best_params
@@ -0,0 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+METHODS = ("shuffle", "bootstrap", "costs")
+METRICS = ("final_balance", "max_drawdown", "sharpe_ratio")
+
+
+def equity_metrics(returns, initial_balance):
+    """
+    Spočítá metriky pro každý řádek matice výnosů obchodů (jedna simulace = jeden řádek).
+
+    Backtest určuje velikost pozic z aktuálního kapitálu, proto se výnosy skládají
+    (kapitál se násobí `1 + r`). Kapitál se mění jen při uzavření obchodu, takže drawdown
+    z křivky po obchodech odpovídá drawdownu z `Backtest.run()`.
+    """
+    # Ztráta nemůže přesáhnout celý kapitál
+    returns = np.maximum(returns, -1.0)
+    equity = initial_balance * np.cumprod(1 + returns, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial_balance)
+    max_drawdown = ((peak - equity) / peak * 100).max(axis=1)
+
+    # Sharpe jako v backtestu (průměr / směrodatná odchylka), ale z výnosů obchodů
+    if returns.shape[1] > 1:
+        std = returns.std(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe_ratio = np.where(std > 0, returns.mean(axis=1) / std, 0.0)
+    else:
+        sharpe_ratio = np.zeros(len(returns))
+
+    return {"final_balance": equity[:, -1], "max_drawdown": max_drawdown, "sharpe_ratio": sharpe_ratio}
+
+
+def simulate_batch(method, trades, initial_balance, n_simulations, seed, slippage=0.0005, fee=0.001):
+    """
+    Provede dávku simulací jednou metodou a vrátí metriky každé simulace.
+
+    :param method: "shuffle" (náhodné pořadí obchodů), "bootstrap" (výběr obchodů s opakováním)
+                   nebo "costs" (náhodný skluz a poplatky)
+    :param trades: Výstup `Backtest.trade_arrays()`
+    :param slippage: Maximální skluz na jednu stranu obchodu jako podíl ceny
+    :param fee: Poplatek na jednu stranu obchodu; v simulaci se náhodně mění v rozsahu 50–150 %
+    """
+    rng = np.random.default_rng(seed)
+    trade_returns = trades["return"]
+    shape = (n_simulations, len(trade_returns))
+
+    if method == "shuffle":
+        returns = rng.permuted(np.tile(trade_returns, (n_simulations, 1)), axis=1)
+    elif method == "bootstrap":
+        returns = trade_returns[rng.integers(0, len(trade_returns), size=shape)]
+    elif method == "costs":
+        # Objem obou stran obchodu vůči kapitálu před obchodem – z něj se platí skluz i poplatek
+        notional = trades["size"] * (trades["entry_price"] + trades["exit_price"]) / trades["balance_before"]
+        slippage_rate = rng.uniform(0, slippage, size=shape)
+        fee_rate = rng.uniform(0.5 * fee, 1.5 * fee, size=(n_simulations, 1))
+        returns = trade_returns - notional * (slippage_rate + fee_rate)
+    else:
+        raise ValueError(f"Neznámá metoda simulace: {method}")
+
+    return equity_metrics(returns, initial_balance)
+
+
+def run_robustness_analysis(trades, initial_balance, n_simulations=5000, batch_size=500, confidence=0.9,
+                            slippage=0.0005, fee=0.001, max_workers=None, seed=None):
+    """
+    Monte Carlo analýza robustnosti obchodů z backtestu.
+
+    Každá metoda z METHODS proběhne `n_simulations`-krát, dávky se rozdělí do procesů.
+    Výsledek je pro každou metodu a metriku pásmo {"low", "median", "high"} odpovídající `confidence`.
+
+    :param trades: Výstup `Backtest.trade_arrays()`
+    :param max_workers: Počet procesů (None = počet CPU, 1 = bez process poolu)
+    :param seed: Seed pro reprodukovatelné výsledky (nezávisle na počtu procesů)
+    :return: Slovník pásem, nebo None, pokud backtest neprovedl žádný obchod
+    """
+    if len(trades["profit"]) == 0:
+        return None
+
+    batches = [(method, min(batch_size, n_simulations - start))
+               for method in METHODS for start in range(0, n_simulations, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    args = [(method, trades, initial_balance, size, batch_seed, slippage, fee)
+            for (method, size), batch_seed in zip(batches, seeds)]
+
+    if max_workers == 1:
+        results = [simulate_batch(*batch_args) for batch_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(simulate_batch, *zip(*args)))
+
+    tail = (1 - confidence) / 2 * 100
+    bands = {}
+    for method in METHODS:
+        method_results = [result for (batch_method, _), result in zip(batches, results) if batch_method == method]
+        bands[method] = {}
+        for metric in METRICS:
+            values = np.concatenate([result[metric] for result in method_results])
+            low, median, high = np.percentile(values, [tail, 50, 100 - tail])
+            bands[method][metric] = {"low": low, "median": median, "high": high}
+
+    return bands
@@ -0,0 +1,118 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Signals:
+    """Sloupcové výstupy strategie – NumPy pole, která backtest čte přímo bez DataFrame."""
+    close: np.ndarray
+    long_signal: np.ndarray
+    short_signal: np.ndarray
+    close_long_signal: np.ndarray
+    close_short_signal: np.ndarray
+    long_stop_loss_price: np.ndarray
+    short_stop_loss_price: np.ndarray
+    long_take_profit_price: np.ndarray
+    short_take_profit_price: np.ndarray
+    long_trailing_stop_price: np.ndarray
+    short_trailing_stop_price: np.ndarray
+
+    def __post_init__(self):
+        # Sjednocení typů: signály jsou bool, cenové hladiny float64
+        for field in fields(self):
+            dtype = bool if field.name.endswith("_signal") else np.float64
+            setattr(self, field.name, np.asarray(getattr(self, field.name), dtype=dtype))
+
+        lengths = {len(getattr(self, field.name)) for field in fields(self)}
+        if len(lengths) > 1:
+            raise ValueError(f"Pole signálů mají různé délky: {sorted(lengths)}")
+
+    def __len__(self):
+        return len(self.close)
+
+    def as_dict(self):
+        """Vrátí pole signálů jako slovník {název sloupce: pole}."""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+class Strategy:
+    """
+    Společné rozhraní strategií pro backtest.
+
+    Potomek implementuje pouze `compute_signals()`, která z OHLCV dat vrátí `Signals`.
+    Řízení risku a velikosti pozic je sdílené, takže každá nová strategie
+    automaticky běží na rychlé (sloupcové) cestě backtestu.
+    """
+
+    def __init__(self, risk_per_trade=0.02, max_drawdown_threshold=0.1, drawdown_risk_factor=0.5, max_risk_per_trade=0.02):
+        """
+        :param risk_per_trade: Riziko na obchod jako podíl kapitálu
+        :param max_drawdown_threshold: Kdy začít snižovat risk (např. 0.1 = 10 %)
+        :param drawdown_risk_factor: Kolik % risku zachovat při drawdownu (0.5 = poloviční risk)
+        :param max_risk_per_trade: Maximální povolené riziko na obchod (např. 2 %)
+        """
+        self.risk_per_trade = risk_per_trade
+        self.max_drawdown_threshold = max_drawdown_threshold
+        self.drawdown_risk_factor = drawdown_risk_factor
+        self.max_risk_per_trade = max_risk_per_trade
+
+    def adjust_risk_based_on_drawdown(self, balance, max_balance):
+        """Upraví velikost risku podle aktuálního drawdownu."""
+        current_drawdown = (max_balance - balance) / max_balance if max_balance > 0 else 0
+
+        if current_drawdown > self.max_drawdown_threshold:
+            adjusted_risk = self.risk_per_trade * self.drawdown_risk_factor
+        else:
+            adjusted_risk = self.risk_per_trade  # Plný risk, pokud drawdown není velký
+
+        return min(adjusted_risk, self.max_risk_per_trade)  # Zabráníme příliš velkému risku
+
+    def calculate_position_size(self, capital, entry_price, stop_loss_price, max_balance):
+        """Vypočítá velikost pozice na základě rizika na obchod a drawdownu."""
+        adjusted_risk = self.adjust_risk_based_on_drawdown(capital, max_balance)
+        risk_amount = capital * adjusted_risk
+        risk_per_unit = max(abs(entry_price - stop_loss_price), 1e-8)  # Fix pro malé ATR
+
+        position_size = risk_amount / risk_per_unit
+        position_size = min(max(position_size, 0.001), capital / entry_price)  # Fix pro velikosti
+        return position_size, stop_loss_price
+
+    def calculate_position_sizes(self, capital, entry_prices, stop_loss_prices, max_balance):
+        """Vektorová varianta `calculate_position_size()` pro celá pole cen."""
+        adjusted_risk = self.adjust_risk_based_on_drawdown(capital, max_balance)
+        risk_amount = capital * adjusted_risk
+        risk_per_unit = np.maximum(np.abs(entry_prices - stop_loss_prices), 1e-8)
+
+        position_sizes = risk_amount / risk_per_unit
+        return np.minimum(np.maximum(position_sizes, 0.001), capital / entry_prices)
+
+    def create_indicators(self):
+        """
+        Vrátí nové instance stavových indikátorů z modulu `indicators`.
+
+        Stav indikátorů se přenáší mezi dávkami svíček ve streamovacím backtestu.
+        Strategie, která vrátí None, podporuje jen backtest nad celým DataFrame.
+        """
+        return None
+
+    def compute_signals(self, data: pd.DataFrame, indicators=None) -> Signals:
+        """
+        Vrátí signály a cenové hladiny pro každou svíčku `data`.
+
+        :param indicators: Stavové indikátory z `create_indicators()`; None = nové (výpočet od začátku historie)
+        """
+        raise NotImplementedError(f"{type(self).__name__} musí implementovat compute_signals()")
+
+    def generate_signals(self, data: pd.DataFrame, capital, max_balance):
+        """Vrátí `data` rozšířená o sloupce signálů a velikostí pozic (pro analýzu a živého bota)."""
+        signals = self.compute_signals(data)
+        data = data.copy()
+        for column, values in signals.as_dict().items():
+            if column != "close":
+                data[column] = values
+
+        data["long_position_size"] = self.calculate_position_sizes(capital, signals.close, signals.long_stop_loss_price, max_balance)
+        data["short_position_size"] = self.calculate_position_sizes(capital, signals.close, signals.short_stop_loss_price, max_balance)
+        return data
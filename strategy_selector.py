@@ -1,9 +1,204 @@
+import numpy as np
+import pandas as pd
+from indicators import ADX, RollingMean, Shift
 from mean_reversion import MeanReversion
+from strategy import Signals, Strategy
+from trend_following import TrendFollowing
+
+# Kódy režimů trhu v polích (UNDEFINED = indikátory se ještě zahřívají)
+UNDEFINED, TRENDING, RANGING, HIGH_VOLATILITY = -1, 0, 1, 2
+REGIME_NAMES = {UNDEFINED: "undefined", TRENDING: "trending", RANGING: "ranging", HIGH_VOLATILITY: "high_volatility"}
+
+
+class RegimeFeatures:
+    """Klouzavé rysy trhu (ADX, realizovaná volatilita, Hurstův odhad) počítané vektorově po dávkách."""
+
+    def __init__(self, adx_period=14, volatility_window=20, volatility_baseline=200, hurst_window=100, hurst_lag=4):
+        """
+        :param volatility_window: Počet svíček pro realizovanou volatilitu log výnosů
+        :param volatility_baseline: Počet svíček dlouhodobého průměru volatility (pro poměr volatility)
+        :param hurst_window: Počet svíček pro odhad Hurstova exponentu z poměru rozptylů
+        :param hurst_lag: Délka vícesvíčkového výnosu pro poměr rozptylů
+        """
+        self.hurst_lag = hurst_lag
+        self.adx = ADX(adx_period)
+        self.prev_log_close = Shift(1)
+        self.lag_log_close = Shift(hurst_lag)
+        self.return_mean = RollingMean(volatility_window)
+        self.return_sq_mean = RollingMean(volatility_window)
+        self.volatility_mean = RollingMean(volatility_baseline)
+        self.hurst_return_mean = RollingMean(hurst_window)
+        self.hurst_return_sq_mean = RollingMean(hurst_window)
+        self.lag_return_mean = RollingMean(hurst_window)
+        self.lag_return_sq_mean = RollingMean(hurst_window)
+
+    def update(self, data: pd.DataFrame):
+        """Vrátí rysy pro každou svíčku dávky jako slovník polí (NaN během zahřívání)."""
+        high = data["high"].to_numpy(dtype=float)
+        low = data["low"].to_numpy(dtype=float)
+        close = data["close"].to_numpy(dtype=float)
+        log_close = np.log(close)
+
+        returns = log_close - self.prev_log_close.update(log_close)
+        lag_returns = log_close - self.lag_log_close.update(log_close)
+
+        # Rozptyl jako E[r²] - E[r]², oříznutý kvůli zaokrouhlení pod nulou
+        variance = np.maximum(self.return_sq_mean.update(returns ** 2) - self.return_mean.update(returns) ** 2, 0.0)
+        volatility = np.sqrt(variance)
+
+        hurst_variance = np.maximum(self.hurst_return_sq_mean.update(returns ** 2) - self.hurst_return_mean.update(returns) ** 2, 0.0)
+        lag_variance = np.maximum(self.lag_return_sq_mean.update(lag_returns ** 2) - self.lag_return_mean.update(lag_returns) ** 2, 0.0)
+        volatility_baseline = self.volatility_mean.update(volatility)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volatility_ratio = volatility / volatility_baseline
+            # Var(r_k) ~ k^(2H) · Var(r_1) → H = log(Var(r_k) / Var(r_1)) / (2 · log k)
+            hurst = np.log(lag_variance / hurst_variance) / (2 * np.log(self.hurst_lag))
+
+        # Plochý trh (nulový rozptyl) nemá trend ani zvýšenou volatilitu → Hurst 0 a poměr 0,
+        # tedy režim RANGING místo nedefinovaného režimu (ten by zavíral pozice). NaN ze zahřívání zůstává.
+        hurst = np.where((hurst_variance == 0) | (lag_variance == 0), 0.0, hurst)
+        volatility_ratio = np.where((volatility == 0) & (volatility_baseline == 0), 0.0, volatility_ratio)
+
+        return {
+            "adx": self.adx.update(high, low, close),
+            "volatility": volatility,
+            "volatility_ratio": volatility_ratio,
+            "hurst": hurst,
+        }
+
+
+class RegimeTracker:
+    """Sleduje režim trhu pro jeden proud svíček (backtest nebo živý bot) – rysy se počítají jen jednou."""
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.features = selector.create_features()
+        self.regime = UNDEFINED  # Poslední rozhodnutý režim
+        self.count = 0  # Počet zpracovaných svíček
+
+    def update(self, data: pd.DataFrame):
+        """Zpracuje nové svíčky a vrátí platný režim pro každou z nich."""
+        raw_regimes = self.selector.classify(self.features.update(data))
+
+        # Režim se mění jen na konci každého okna `switch_window` svíček a platí do dalšího rozhodnutí
+        positions = np.arange(len(raw_regimes))
+        is_decision = (self.count + positions + 1) % self.selector.switch_window == 0
+        last_decision = np.maximum.accumulate(np.where(is_decision, positions, -1)) if len(positions) else positions
+        regimes = np.where(last_decision >= 0, raw_regimes[np.maximum(last_decision, 0)], self.regime)
+
+        if len(regimes):
+            self.regime = int(regimes[-1])
+        self.count += len(regimes)
+        return regimes
+
 
 class StrategySelector:
-    def __init__(self):
-        self.mean_reversion = MeanReversion()
+    def __init__(self, strategies=None, adx_threshold=25, hurst_threshold=0.5, high_volatility_ratio=1.5,
+                 switch_window=24, adx_period=14, volatility_window=20, volatility_baseline=200,
+                 hurst_window=100, hurst_lag=4):
+        """
+        :param strategies: Strategie pro režimy {"trending", "ranging", "high_volatility"}; None = neobchodovat
+        :param adx_threshold: Minimální ADX pro trendový režim
+        :param hurst_threshold: Minimální Hurstův odhad pro trendový režim (0.5 = náhodná procházka)
+        :param high_volatility_ratio: Poměr aktuální a dlouhodobé volatility, od kterého je trh volatilní
+        :param switch_window: Po kolika svíčkách se režim přehodnocuje
+        """
+        if strategies is None:
+            strategies = {"trending": TrendFollowing(), "ranging": MeanReversion(), "high_volatility": None}
+
+        self.strategies = strategies
+        self.adx_threshold = adx_threshold
+        self.hurst_threshold = hurst_threshold
+        self.high_volatility_ratio = high_volatility_ratio
+        self.switch_window = switch_window
+        self.feature_params = {
+            "adx_period": adx_period,
+            "volatility_window": volatility_window,
+            "volatility_baseline": volatility_baseline,
+            "hurst_window": hurst_window,
+            "hurst_lag": hurst_lag,
+        }
+
+    def create_features(self):
+        return RegimeFeatures(**self.feature_params)
+
+    def create_tracker(self):
+        """Vrátí nový `RegimeTracker` pro inkrementální sledování režimu."""
+        return RegimeTracker(self)
+
+    def classify(self, features):
+        """Vektorově přiřadí každé svíčce režim trhu podle rysů z `RegimeFeatures.update()`."""
+        adx = features["adx"]
+        valid = ~(np.isnan(adx) | np.isnan(features["volatility_ratio"]) | np.isnan(features["hurst"]))
+        with np.errstate(invalid="ignore"):
+            trending = (adx >= self.adx_threshold) & (features["hurst"] >= self.hurst_threshold)
+            high_volatility = features["volatility_ratio"] >= self.high_volatility_ratio
+
+        regimes = np.full(len(adx), UNDEFINED)
+        regimes[valid] = RANGING
+        regimes[valid & trending] = TRENDING
+        regimes[valid & high_volatility] = HIGH_VOLATILITY
+        return regimes
+
+    def strategy_for(self, regime):
+        """Vrátí strategii pro kód režimu (None = v tomto režimu neobchodovat)."""
+        return self.strategies.get(REGIME_NAMES[regime])
 
     def select_strategy(self, historical_data):
-        # Prozatím máme jen Mean Reversion, takže ji vždy vrátíme
-        return self.mean_reversion
+        """Vybere strategii podle režimu poslední svíčky `historical_data`."""
+        regimes = self.create_tracker().update(historical_data)
+        return self.strategy_for(regimes[-1])
+
+
+class RegimeSwitching(Strategy):
+    """
+    Strategie, která podle režimu trhu z `StrategySelector` přepíná mezi dílčími strategiemi.
+
+    Signály všech dílčích strategií i rysy režimu se spočítají vektorově jednou za dávku
+    a sloučí se podle pole režimů. V režimu bez strategie se neotevírají pozice
+    a otevřené pozice se zavírají.
+    """
+
+    def __init__(self, selector=None, risk_per_trade=0.02, max_drawdown_threshold=0.1, drawdown_risk_factor=0.5, max_risk_per_trade=0.02):
+        super().__init__(risk_per_trade, max_drawdown_threshold, drawdown_risk_factor, max_risk_per_trade)
+        self.selector = selector or StrategySelector()
+
+    def create_indicators(self):
+        indicators = {"regime": self.selector.create_tracker()}
+        for name, strategy in self.selector.strategies.items():
+            if strategy is not None:
+                indicators[name] = strategy.create_indicators()
+        return indicators
+
+    def compute_signals(self, data: pd.DataFrame, indicators=None) -> Signals:
+        """Sloučí signály dílčích strategií podle režimu každé svíčky."""
+        if indicators is None:
+            indicators = self.create_indicators()
+
+        regimes = indicators["regime"].update(data)
+        close = data["close"].to_numpy(dtype=float)
+
+        # Výchozí stav odpovídá režimu bez strategie: žádné vstupy, zavření pozic
+        merged = {
+            "long_signal": np.zeros(len(close), dtype=bool),
+            "short_signal": np.zeros(len(close), dtype=bool),
+            "close_long_signal": np.ones(len(close), dtype=bool),
+            "close_short_signal": np.ones(len(close), dtype=bool),
+        }
+        for column in ("long_stop_loss_price", "short_stop_loss_price", "long_take_profit_price",
+                       "short_take_profit_price", "long_trailing_stop_price", "short_trailing_stop_price"):
+            merged[column] = np.full(len(close), np.nan)
+
+        for regime in (TRENDING, RANGING, HIGH_VOLATILITY):
+            strategy = self.selector.strategy_for(regime)
+            if strategy is None:
+                continue
+
+            # Dílčí strategie běží na všech svíčkách, aby její indikátory zůstaly zahřáté
+            signals = strategy.compute_signals(data, indicators[REGIME_NAMES[regime]]).as_dict()
+            mask = regimes == regime
+            for column, values in merged.items():
+                values[mask] = signals[column][mask]
+
+        return Signals(close=close, **merged)
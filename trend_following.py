@@ -1,12 +1,80 @@
-class TrendFollowing:
-    def __init__(self, param1=10, param2=50):
-        self.param1 = param1
-        self.param2 = param2
-
-    def generate_signals(self, historical_data):
-        # Implementace Trend Following logiky (zatím prázdné)
-        return ["BUY", "HOLD", "SELL"]
-
-    def backtest(self, historical_data, initial_balance=10000):
-        # Implementace backtestu pro Trend Following (zatím prázdné)
-        return {"final_balance": initial_balance, "trades": 0, "win_rate": 0}
+import pandas as pd
+from rich.console import Console
+from indicators import ATR, RollingMax, RollingMean, RollingMin, Shift
+from strategy import Signals, Strategy
+
+console = Console()
+
+class TrendFollowing(Strategy):
+    def __init__(self, fast_period=10, slow_period=50, breakout_period=20,
+                 take_profit=0.06, trailing_stop=0.03, risk_per_trade=0.02, atr_multiplier=2.0,
+                 max_drawdown_threshold=0.1, drawdown_risk_factor=0.5, max_risk_per_trade=0.02):
+        """
+        :param fast_period: Perioda rychlého klouzavého průměru
+        :param slow_period: Perioda pomalého klouzavého průměru
+        :param breakout_period: Počet předchozích svíček pro průraz maxima / minima (Donchian kanál)
+        :param max_drawdown_threshold: Kdy začít snižovat risk (např. 0.1 = 10 %)
+        :param drawdown_risk_factor: Kolik % risku zachovat při drawdownu (0.5 = poloviční risk)
+        :param max_risk_per_trade: Maximální povolené riziko na obchod (např. 2 %)
+        """
+
+        super().__init__(risk_per_trade, max_drawdown_threshold, drawdown_risk_factor, max_risk_per_trade)
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.breakout_period = breakout_period
+        self.take_profit = take_profit
+        self.trailing_stop = trailing_stop
+        self.atr_multiplier = atr_multiplier
+
+    def create_indicators(self):
+        return {
+            "fast_ma": RollingMean(self.fast_period),
+            "slow_ma": RollingMean(self.slow_period),
+            "upper_channel": RollingMax(self.breakout_period),
+            "lower_channel": RollingMin(self.breakout_period),
+            "upper_shift": Shift(),
+            "lower_shift": Shift(),
+            "atr": ATR(14),
+        }
+
+    def compute_signals(self, data: pd.DataFrame, indicators=None) -> Signals:
+        """Generuje signály z křížení klouzavých průměrů a průrazu Donchian kanálu."""
+        if indicators is None:
+            indicators = self.create_indicators()
+
+        high = data["high"].to_numpy(dtype=float)
+        low = data["low"].to_numpy(dtype=float)
+        close = data["close"].to_numpy(dtype=float)
+
+        fast_ma = indicators["fast_ma"].update(close)
+        slow_ma = indicators["slow_ma"].update(close)
+
+        # Kanál z předchozích svíček – aktuální svíčka ho musí prorazit
+        upper_channel = indicators["upper_shift"].update(indicators["upper_channel"].update(high))
+        lower_channel = indicators["lower_shift"].update(indicators["lower_channel"].update(low))
+
+        atr = indicators["atr"].update(high, low, close)
+
+        # Porovnání s NaN (zahřívání indikátorů) vrací False → žádný signál
+        uptrend = fast_ma > slow_ma
+        downtrend = fast_ma < slow_ma
+        atr_distance = atr * max(self.atr_multiplier, 1.0)
+
+        signals = Signals(
+            close=close,
+            # Vstup ve směru trendu při průrazu kanálu
+            long_signal=uptrend & (close > upper_channel),
+            short_signal=downtrend & (close < lower_channel),
+            # Výstup při otočení trendu
+            close_long_signal=downtrend,
+            close_short_signal=uptrend,
+            long_stop_loss_price=close - atr_distance,
+            short_stop_loss_price=close + atr_distance,
+            long_take_profit_price=close * (1 + self.take_profit),
+            short_take_profit_price=close * (1 - self.take_profit),
+            long_trailing_stop_price=close * (1 - self.trailing_stop),
+            short_trailing_stop_price=close * (1 + self.trailing_stop),
+        )
+
+        console.print(f"[bold yellow]DEBUG: LONG signály: {signals.long_signal.sum()}, SHORT signály: {signals.short_signal.sum()}[/bold yellow]")
+        return signals